@@ -1,69 +1,215 @@
 import os
 import json
-import base64
-import io
 import re
+import gzip
+import hashlib
 import logging
+import functools
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
-from flask import Flask, request, jsonify, render_template, send_from_directory
+import anthropic
+import orjson
+from flask import Flask, Response, request, jsonify, render_template, url_for
+from flask.json.provider import JSONProvider
 from dotenv import load_dotenv
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+from googleapiclient.http import MediaIoBaseUpload, build_http
+
+try:
+    # SIMD-accelerated drop-in for base64.b64decode
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
 
 # Suppress file_cache warning from google-api-python-client
 logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.ERROR)
 
 load_dotenv()
 
+
+class OrjsonProvider(JSONProvider):
+    """Route Flask's JSON handling (jsonify, request.get_json) through orjson."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
 app = Flask(
     __name__,
-    template_folder=os.path.join(os.path.dirname(__file__), '..', 'templates'),
-    static_folder=os.path.join(os.path.dirname(__file__), '..', 'static'),
+    template_folder=os.path.join(BASE_DIR, 'templates'),
+    static_folder=os.path.join(BASE_DIR, 'static'),
 )
+app.json = OrjsonProvider(app)
+
+# Nothing configures the root logger under Vercel or gunicorn; app.logger writes to
+# stderr through Flask's default handler, so only its level needs raising
+app.logger.setLevel(logging.INFO)
+
+# Static asset URLs carry a version (see static_url), so browsers may cache them for a year
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+
+# Anthropic rejects images over 5 MB, so refuse anything larger before doing any work
+MAX_IMAGE_B64_LENGTH = 5 * 1024 * 1024
+
+# Padded standard base64 with whitespace removed, as Base64StreamReader requires
+_BASE64_RE = re.compile(r'[A-Za-z0-9+/]*={0,2}')
 
 # ===== Config Loading =====
-CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'questions.json')
+CONFIG_PATH = os.path.join(BASE_DIR, 'config', 'questions.json')
+
+
+_CONFIG_CACHE = {'mtime': None, 'data': None}
 
 
 def load_config():
-    with open(CONFIG_PATH, 'r') as f:
-        return json.load(f)
+    """Return the parsed questions config, re-reading the file only when its mtime changes."""
+    mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    if _CONFIG_CACHE['mtime'] != mtime:
+        with open(CONFIG_PATH, 'rb') as f:
+            _CONFIG_CACHE['data'] = orjson.loads(f.read())
+        _CONFIG_CACHE['mtime'] = mtime
+    return _CONFIG_CACHE['data']
+
+
+def per_config(builder):
+    """Memoize builder(config) until load_config() returns a new config."""
+    cache = {'entry': None}
+
+    @functools.wraps(builder)
+    def wrapper():
+        config = load_config()
+        entry = cache['entry']
+        if entry is None or entry[0] is not config:
+            entry = cache['entry'] = (config, builder(config))
+        return entry[1]
+
+    return wrapper
+
+
+@per_config
+def _config_payload(config):
+    """Pre-serialized /api/config bodies, one ETag per encoding."""
+    body = orjson.dumps(config)
+    etag = hashlib.md5(body, usedforsecurity=False).hexdigest()
+    return {
+        'identity': (body, etag),
+        'gzip': (gzip.compress(body, 6), f'{etag}-gz'),
+    }
 
 
 # ===== Google Auth Helper =====
-def get_google_credentials():
-    """Decode base64-encoded service account JSON from env var."""
+@functools.lru_cache(maxsize=1)
+def _get_creds_dict():
+    """Decode the base64-encoded service account JSON from the env var."""
     creds_b64 = os.environ.get('GOOGLE_SHEETS_CREDS', '')
     if not creds_b64:
         raise ValueError('GOOGLE_SHEETS_CREDS environment variable is not set')
 
-    creds_json = base64.b64decode(creds_b64).decode('utf-8')
-    creds_info = json.loads(creds_json)
+    return orjson.loads(b64decode(creds_b64))
+
 
-    from google.oauth2.service_account import Credentials
+@functools.lru_cache(maxsize=1)
+def get_google_credentials():
+    """Build service account credentials, shared across requests."""
     scopes = [
         'https://www.googleapis.com/auth/spreadsheets',
         'https://www.googleapis.com/auth/drive.file',
     ]
-    return Credentials.from_service_account_info(creds_info, scopes=scopes)
+    return Credentials.from_service_account_info(_get_creds_dict(), scopes=scopes)
+
+
+# httplib2 is not thread-safe, so each worker thread keeps its own keep-alive connection
+_thread_local = threading.local()
+
+
+def _authorized_http(creds):
+    """Return this thread's authorized httplib2 transport, reused across requests."""
+    http = getattr(_thread_local, 'google_http', None)
+    if http is None:
+        # build_http() sets the client's 60 s timeout and stops httplib2 following the
+        # 308 that resumable uploads use to report progress
+        http = _thread_local.google_http = AuthorizedHttp(creds, http=build_http())
+    return http
+
+
+def _google_service(name, version, creds):
+    """Return this thread's discovery-built service, so the discovery doc is parsed once."""
+    services = getattr(_thread_local, 'google_services', None)
+    if services is None:
+        services = _thread_local.google_services = {}
+    service = services.get((name, version))
+    if service is None:
+        # Use the discovery doc bundled with the library; never fetch it over the network
+        service = services[(name, version)] = build(
+            name, version, http=_authorized_http(creds), cache_discovery=False, static_discovery=True)
+    return service
+
+
+# Runs the sheet header check alongside a submit's Drive upload. Each submit queues one
+# task and waits on it, so the pool needs at least gunicorn's per-process threads
+# (gunicorn.conf.py) for a submit never to wait for a free slot.
+IO_POOL_SIZE = 64
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=IO_POOL_SIZE)
 
 
 # ===== Routes =====
 
+@app.context_processor
+def static_helpers():
+    return {'static_url': static_url}
+
+
+def static_url(filename):
+    """URL for a static asset, versioned by its content so a changed file busts the cache."""
+    path = os.path.join(app.static_folder, filename)
+    return url_for('static', filename=filename, v=_file_digest(path, os.stat(path).st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=32)
+def _file_digest(path, mtime):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read(), usedforsecurity=False).hexdigest()[:12]
+
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
 
-@app.route('/static/<path:filename>')
-def serve_static(filename):
-    return send_from_directory(app.static_folder, filename)
-
-
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """Return the questions config to the frontend."""
-    config = load_config()
-    return jsonify(config)
+    # Check the quality, not membership: 'gzip;q=0' means the client refuses gzip
+    encoding = 'gzip' if request.accept_encodings['gzip'] > 0 else 'identity'
+    body, etag = _config_payload()[encoding]
+
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+        if encoding == 'gzip':
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    return response
 
 
 @app.route('/api/assess', methods=['POST'])
@@ -79,48 +225,17 @@ def assess():
 
     if not image_b64:
         return jsonify({'error': 'No image provided'}), 400
+    if len(image_b64) > MAX_IMAGE_B64_LENGTH:
+        return jsonify({'error': 'Image is too large'}), 413
 
     api_key = os.environ.get('ANTHROPIC_API_KEY', '')
     if not api_key:
         return jsonify({'error': 'ANTHROPIC_API_KEY is not configured'}), 500
 
-    # Load config and build prompt
-    config = load_config()
-    prompt = build_assessment_prompt(config, metadata)
+    prompt = build_assessment_prompt(metadata)
 
     try:
-        import anthropic
-        client = anthropic.Anthropic(api_key=api_key)
-
-        message = client.messages.create(
-            model='claude-sonnet-4-5-20250929',
-            max_tokens=4096,
-            messages=[
-                {
-                    'role': 'user',
-                    'content': [
-                        {
-                            'type': 'image',
-                            'source': {
-                                'type': 'base64',
-                                'media_type': media_type,
-                                'data': image_b64,
-                            },
-                        },
-                        {
-                            'type': 'text',
-                            'text': prompt,
-                        },
-                    ],
-                }
-            ],
-        )
-
-        # Extract text response
-        response_text = message.content[0].text
-
-        # Parse JSON from the response (handle markdown code fences)
-        result = parse_json_response(response_text)
+        result = run_assessment(api_key, image_b64, media_type, prompt)
         return jsonify(result)
 
     except Exception as e:
@@ -144,6 +259,17 @@ def submit():
     image_b64 = data.get('image', '')
     media_type = data.get('media_type', 'image/jpeg')
 
+    if image_b64:
+        if not isinstance(image_b64, str):
+            return jsonify({'error': 'Image is not valid base64'}), 400
+        if len(image_b64) > MAX_IMAGE_B64_LENGTH:
+            return jsonify({'error': 'Image is too large'}), 413
+        # The upload decodes in fixed 4-character groups, so reject anything it would
+        # misread here rather than partway through the Drive upload
+        image_b64 = ''.join(image_b64.split())
+        if len(image_b64) % 4 or not _BASE64_RE.fullmatch(image_b64):
+            return jsonify({'error': 'Image is not valid base64'}), 400
+
     sheet_id = os.environ.get('GOOGLE_SHEET_ID', '')
     drive_folder_id = os.environ.get('GOOGLE_DRIVE_FOLDER_ID', '')
 
@@ -153,60 +279,76 @@ def submit():
     try:
         creds = get_google_credentials()
 
+        # The sheet header check doesn't depend on the upload, so overlap the two
+        header_ready = _IO_EXECUTOR.submit(ensure_header_row, creds, sheet_id)
+
         # Upload image to Google Drive
         image_link = ''
         if image_b64 and drive_folder_id:
             image_link = upload_to_drive(creds, image_b64, media_type, metadata, drive_folder_id)
 
+        header_ready.result()
+
         # Append to Google Sheet
-        append_to_sheet(creds, sheet_id, metadata, assessments, inferred_metadata,
-                        accessibility_rating, final_comments, assessor_comments,
-                        overall_notes, image_link)
+        append_to_sheet(
+            creds, sheet_id, metadata, assessments, inferred_metadata,
+            accessibility_rating, final_comments, assessor_comments,
+            overall_notes, image_link)
 
         return jsonify({'success': True})
 
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
 
 # ===== Helpers =====
 
-def build_assessment_prompt(config, metadata):
-    """Build the Claude prompt from the questions config."""
-    metadata_context = ''
+def build_assessment_prompt(metadata):
+    """Build the per-request part of the Claude prompt from the user-provided metadata."""
+    prompt = 'Assess the digital sign in the attached photo.\n'
     if metadata:
-        metadata_context = '\nUser-provided context about this sign:\n'
-        for key, value in metadata.items():
-            if value:
-                metadata_context += f'- {key}: {value}\n'
+        prompt += '\nUser-provided context about this sign:\n' + ''.join(
+            f'- {key}: {value}\n' for key, value in metadata.items() if value
+        )
+    return prompt
+
+
+def _build_system_prompt(config):
+    """Build the static Claude instructions from the questions config.
 
+    The text only changes with the config, so it is sent as a cacheable system prompt.
+    """
     # Build AI-inferred fields instructions
     ai_fields = config.get('ai_inferred_fields', [])
-    ai_fields_instructions = ''
-    ai_fields_schema = ''
+    ai_fields_instructions = []
+    ai_fields_schema = []
     for field in ai_fields:
         options = field.get('options', [])
         options_str = ', '.join(f'"{o}"' for o in options)
-        ai_fields_instructions += f'- **{field["id"]}**: {field["label"]}. Must be one of: {options_str}\n'
-        ai_fields_schema += f'    "{field["id"]}": "one of: {", ".join(options)}",\n'
+        ai_fields_instructions.append(f'- **{field["id"]}**: {field["label"]}. Must be one of: {options_str}\n')
+        ai_fields_schema.append(f'    "{field["id"]}": "one of: {", ".join(options)}",\n')
+    ai_fields_instructions = ''.join(ai_fields_instructions)
+    ai_fields_schema = ''.join(ai_fields_schema)
 
     # Build category assessment instructions
-    categories_text = ''
-    category_ids = []
+    categories_text = []
+    assessments_schema = []
     for category in config.get('categories', []):
-        categories_text += f'\n### {category["name"]} (id: "{category["id"]}")\n'
+        categories_text.append(f'\n### {category["name"]} (id: "{category["id"]}")\n')
         if category.get('guidance'):
-            categories_text += f'Evaluation criteria:\n{category["guidance"]}\n'
-        category_ids.append(category['id'])
+            categories_text.append(f'Evaluation criteria:\n{category["guidance"]}\n')
+        assessments_schema.append(f'    "{category["id"]}": "Your 2-4 sentence assessment paragraph...",')
+    categories_text = ''.join(categories_text)
+    assessments_schema = '\n'.join(assessments_schema)
 
     # Build overall rating options
     rating_config = config.get('overall_rating', {})
     rating_options = rating_config.get('options', [])
     rating_options_str = ', '.join(f'"{o}"' for o in rating_options)
+    rating_options_schema = ', '.join(rating_options)
 
-    prompt = f"""You are a fair but thorough accessibility auditor evaluating a digital sign on a university campus for compliance with Section 504 accessibility standards. Your goal is to produce accurate, evidence-based assessments that identify real accessibility barriers while giving appropriate credit for things done well.
+    return f"""You are a fair but thorough accessibility auditor evaluating a digital sign on a university campus for compliance with Section 504 accessibility standards. Your goal is to produce accurate, evidence-based assessments that identify real accessibility barriers while giving appropriate credit for things done well.
 
 IMPORTANT RATING PHILOSOPHY:
 - Be accurate and evidence-based. Assess what you can actually observe, not speculate about.
@@ -227,7 +369,7 @@ IMPORTANT RATING PHILOSOPHY:
 - "Partially Accessible" is appropriate when there are multiple clear issues — such as a combination of dense text, small details, and information overload.
 - "Mostly Inaccessible" or "Fully Inaccessible" should be reserved for signs with severe barriers (very poor contrast, unreadable text, completely inaccessible design).
 - The overall rating should honestly reflect how accessible the sign is to someone with low vision, cognitive disabilities, or who is simply passing by quickly.
-{metadata_context}
+
 Analyze the attached photo of a digital sign and provide a detailed, balanced assessment for each category below.
 
 For each category, write a 2-4 sentence assessment paragraph that:
@@ -257,9 +399,9 @@ Return your response as valid JSON matching this exact schema. Do NOT wrap it in
     "additional_context": "any other observations"
   }},
   "assessments": {{
-{chr(10).join(f'    "{cid}": "Your 2-4 sentence assessment paragraph...",' for cid in category_ids)}
+{assessments_schema}
   }},
-  "accessibility_rating": "one of: {', '.join(rating_options)}",
+  "accessibility_rating": "one of: {rating_options_schema}",
   "final_comments": "Any additional accessibility observations not covered by the categories above",
   "overall_notes": "Extra context about the sign environment, placement, or other relevant details"
 }}
@@ -267,33 +409,28 @@ Return your response as valid JSON matching this exact schema. Do NOT wrap it in
 Categories to evaluate:
 {categories_text}"""
 
-    return prompt
+
+_system_prompt = per_config(_build_system_prompt)
+
+
+_FENCE_RE = re.compile(r'```(?:json)?\s*\n?(.*?)\n?```', re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
 
 
 def parse_json_response(text):
     """Parse JSON from Claude's response, handling markdown code fences."""
     # Try to extract JSON from code fences
-    fence_match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', text, re.DOTALL)
+    fence_match = _FENCE_RE.search(text)
     if fence_match:
         text = fence_match.group(1)
 
-    # Try to find JSON object
-    brace_start = text.find('{')
-    if brace_start != -1:
-        # Find the matching closing brace
-        depth = 0
-        for i in range(brace_start, len(text)):
-            if text[i] == '{':
-                depth += 1
-            elif text[i] == '}':
-                depth -= 1
-                if depth == 0:
-                    text = text[brace_start:i + 1]
-                    break
-
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        # Decode the first JSON object, ignoring any trailing prose
+        brace_start = text.find('{')
+        if brace_start != -1:
+            return _JSON_DECODER.raw_decode(text, brace_start)[0]
+        return orjson.loads(text)
+    except json.JSONDecodeError:  # Also raised by orjson
         # Return a fallback structure
         return {
             'inferred_metadata': {},
@@ -302,12 +439,126 @@ def parse_json_response(text):
         }
 
 
+@functools.lru_cache(maxsize=1)
+def get_anthropic_client(api_key):
+    """Build the Anthropic client once so its keep-alive connection pool is reused."""
+    return anthropic.Anthropic(api_key=api_key)
+
+
+def run_assessment(api_key, image_b64, media_type, prompt):
+    """Stream Claude's assessment of the image and return the parsed JSON."""
+    # The static instructions go first, in a cached system block, so repeat calls
+    # reuse the prompt cache; only the image and metadata differ per request.
+    system = [
+        {
+            'type': 'text',
+            'text': _system_prompt(),
+            'cache_control': {'type': 'ephemeral'},
+        },
+    ]
+
+    with get_anthropic_client(api_key).messages.stream(
+        model='claude-sonnet-4-5-20250929',
+        max_tokens=4096,
+        system=system,
+        messages=[
+            {
+                'role': 'user',
+                'content': [
+                    {
+                        'type': 'image',
+                        'source': {
+                            'type': 'base64',
+                            'media_type': media_type,
+                            'data': image_b64,
+                        },
+                    },
+                    {
+                        'type': 'text',
+                        'text': prompt,
+                    },
+                ],
+            }
+        ],
+    ) as stream:
+        result = read_json_stream(stream.text_stream)
+        # Drain the few events left after the JSON (at most a closing code fence);
+        # closing a half-read response discards the connection instead of pooling it
+        usage = stream.get_final_message().usage
+        app.logger.info('Assessment prompt cache: %s tokens read, %s tokens written',
+                        usage.cache_read_input_tokens, usage.cache_creation_input_tokens)
+
+    return result
+
+
+def read_json_stream(text_stream):
+    """Consume streamed Claude text and return as soon as the first JSON object is complete."""
+    chunks = []
+    for chunk in text_stream:
+        chunks.append(chunk)
+        if '}' not in chunk:
+            continue
+        text = ''.join(chunks)
+        brace_start = text.find('{')
+        if brace_start != -1:
+            try:
+                return _JSON_DECODER.raw_decode(text, brace_start)[0]
+            except json.JSONDecodeError:
+                pass  # Object not closed yet
+
+    # Stream ended without a complete object; fall back to the full-text parser
+    return parse_json_response(''.join(chunks))
+
+
+def b64_decoded_len(data):
+    """Size in bytes of the decoded form of an unwrapped base64 string, without decoding it."""
+    return len(data) // 4 * 3 - data[-2:].count('=')
+
+
+class Base64StreamReader:
+    """Seekable read-only file object over the decoded bytes of a base64 string.
+
+    Decodes only the 4-character groups covering each read. Expects unwrapped
+    base64 with no whitespace, as produced by the frontend's canvas.toDataURL().
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._size = b64_decoded_len(data)
+        self._pos = 0
+
+    def read(self, size=-1):
+        start = self._pos
+        end = self._size if size is None or size < 0 else min(start + size, self._size)
+        if start >= end:
+            return b''
+        first_group, skip = divmod(start, 3)
+        last_group = (end + 2) // 3
+        chunk = b64decode(self._data[first_group * 4:last_group * 4], validate=False)
+        self._pos = end
+        return chunk[skip:skip + end - start]
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._size
+        self._pos = max(offset, 0)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+
 def upload_to_drive(creds, image_b64, media_type, metadata, folder_id):
     """Upload image to Google Drive and return a shareable link."""
-    from googleapiclient.discovery import build
-    from googleapiclient.http import MediaIoBaseUpload
-
-    service = build('drive', 'v3', credentials=creds, cache_discovery=False)
+    service = _google_service('drive', 'v3', creds)
 
     # Build filename
     building = metadata.get('building', 'unknown').replace(' ', '_')
@@ -315,9 +566,10 @@ def upload_to_drive(creds, image_b64, media_type, metadata, folder_id):
     timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
     filename = f'{building}_{location}_{timestamp}.jpg'
 
-    # Decode image
-    image_bytes = base64.b64decode(image_b64)
-    media = MediaIoBaseUpload(io.BytesIO(image_bytes), mimetype=media_type)
+    # Decode the image while it streams out in a single resumable request, so the
+    # decoded bytes are never held in memory alongside the base64 string
+    media = MediaIoBaseUpload(Base64StreamReader(image_b64), mimetype=media_type,
+                              chunksize=-1, resumable=True)
 
     file_metadata = {
         'name': filename,
@@ -331,85 +583,134 @@ def upload_to_drive(creds, image_b64, media_type, metadata, folder_id):
         supportsAllDrives=True,
     ).execute()
 
-    # Make viewable by anyone with link
-    service.permissions().create(
-        fileId=file['id'],
-        body={'type': 'anyone', 'role': 'reader'},
-        supportsAllDrives=True,
-    ).execute()
+    # Make viewable by anyone with link, unless the folder already shares its files publicly
+    if os.environ.get('GOOGLE_DRIVE_FOLDER_PUBLIC', '') != '1':
+        service.permissions().create(
+            fileId=file['id'],
+            body={'type': 'anyone', 'role': 'reader'},
+            supportsAllDrives=True,
+        ).execute()
 
     return file.get('webViewLink', '')
 
 
-def append_to_sheet(creds, sheet_id, metadata, assessments, inferred_metadata,
-                    accessibility_rating, final_comments, assessor_comments,
-                    overall_notes, image_link):
-    """Append one row of assessment results to the Google Sheet."""
-    import gspread
+SHEETS_API = 'https://sheets.googleapis.com/v4/spreadsheets'
+SHEETS_TIMEOUT = 60
 
-    # Decode service account JSON for gspread's native auth (avoids file_cache issues)
-    creds_b64 = os.environ.get('GOOGLE_SHEETS_CREDS', '')
-    creds_json = json.loads(base64.b64decode(creds_b64).decode('utf-8'))
-    gc = gspread.service_account_from_dict(creds_json)
-    sheet = gc.open_by_key(sheet_id).sheet1
 
-    config = load_config()
+@functools.lru_cache(maxsize=1)
+def _sheets_session(creds):
+    """Keep-alive session for the Sheets REST API, shared by every thread in the process.
+
+    requests doesn't promise Session is thread-safe; sharing is fine here only because
+    callers never touch session state (cookies, headers) and urllib3's pool is locked.
+    """
+    session = AuthorizedSession(creds)
+    # Appends run on gunicorn's request threads, so the default 10 pooled connections per
+    # host would churn under concurrent submits. IO_POOL_SIZE is kept at or above the
+    # request thread count (gunicorn.conf.py), so it bounds the concurrent appends.
+    session.mount('https://', HTTPAdapter(pool_maxsize=IO_POOL_SIZE))
+    return session
 
-    # Ensure header row exists — write it directly to row 1 if missing
-    headers = build_header_row(config)
+
+def _check_sheets_response(response):
+    """Raise with Google's error message; raise_for_status() would echo the sheet URL instead."""
+    if response.ok:
+        return
     try:
-        first_cell = sheet.cell(1, 1).value
-    except Exception:
-        first_cell = None
+        message = response.json()['error']['message']
+    except (ValueError, KeyError, TypeError):
+        message = response.reason
+    raise RuntimeError(f'Google Sheets API error {response.status_code}: {message}')
 
-    if first_cell != 'Timestamp':
-        # Write header into row 1 (overwrites whatever is there)
-        sheet.update(range_name='A1', values=[headers], value_input_option='USER_ENTERED')
 
-    # Build data row
-    timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')
-    row = [timestamp]
+# (sheet_id, config mtime) pairs whose header row has been verified by this process
+_HEADER_WRITTEN = set()
 
-    # Metadata columns (user-entered + auto-populated like floor_owner)
-    # When "Other" is selected, substitute the user-typed specification
-    for field in config.get('metadata_fields', []):
-        value = metadata.get(field['id'], '')
-        other_value = metadata.get(f"{field['id']}_other", '')
-        if value == 'Other' and other_value:
-            value = f"Other: {other_value}"
-        row.append(value)
 
-    # AI-inferred fields (sign_type, orientation, etc.)
-    for field in config.get('ai_inferred_fields', []):
-        row.append(inferred_metadata.get(field['id'], ''))
+def append_to_sheet(creds, sheet_id, metadata, assessments, inferred_metadata,
+                    accessibility_rating, final_comments, assessor_comments,
+                    overall_notes, image_link):
+    """Append one row of assessment results to the Google Sheet."""
+    ensure_header_row(creds, sheet_id)
 
-    # Image link
-    row.append(image_link)
+    columns = _sheet_columns()
 
-    # Assessment columns (one text column per category)
-    for category in config.get('categories', []):
-        row.append(assessments.get(category['id'], ''))
+    # Extra inferred context (building, additional_context — anything not in ai_inferred_fields)
+    extra_inferred = ''
+    if inferred_metadata:
+        extra_inferred = ', '.join(
+            f'{k}: {v}' for k, v in inferred_metadata.items() if v and k not in columns.ai_field_id_set
+        )
 
-    # Accessibility rating
-    row.append(accessibility_rating)
+    # Build data row; columns follow build_header_row()
+    row = [
+        datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC'),
+        # Metadata columns (user-entered + auto-populated like floor_owner)
+        # When "Other" is selected, substitute the user-typed specification
+        *(_metadata_cell(metadata, field_id, other_id) for field_id, other_id in columns.metadata_field_ids),
+        # AI-inferred fields (sign_type, orientation, etc.)
+        *(inferred_metadata.get(field_id, '') for field_id in columns.ai_field_ids),
+        image_link,
+        # Assessment columns (one text column per category)
+        *(assessments.get(category_id, '') for category_id in columns.category_ids),
+        accessibility_rating,
+        final_comments,      # AI
+        assessor_comments,   # human
+        overall_notes,
+        extra_inferred,
+    ]
 
-    # Final comments (AI)
-    row.append(final_comments)
+    # Ranges without a sheet name resolve to the first sheet
+    response = _sheets_session(creds).post(
+        f'{SHEETS_API}/{sheet_id}/values/A1:append',
+        params={'valueInputOption': 'USER_ENTERED', 'insertDataOption': 'INSERT_ROWS'},
+        json={'values': [row]},
+        timeout=SHEETS_TIMEOUT,
+    )
+    _check_sheets_response(response)
 
-    # Assessor comments (human)
-    row.append(assessor_comments)
 
-    # Overall notes
-    row.append(overall_notes)
+def _metadata_cell(metadata, field_id, other_id):
+    value = metadata.get(field_id, '')
+    other_value = metadata.get(other_id, '')
+    if value == 'Other' and other_value:
+        value = f"Other: {other_value}"
+    return value
 
-    # Extra inferred context (building, additional_context — anything not in ai_inferred_fields)
-    ai_field_ids = {f['id'] for f in config.get('ai_inferred_fields', [])}
-    extra_inferred = ', '.join(
-        f'{k}: {v}' for k, v in inferred_metadata.items() if v and k not in ai_field_ids
-    )
-    row.append(extra_inferred)
 
-    sheet.append_row(row, value_input_option='USER_ENTERED')
+def ensure_header_row(creds, sheet_id):
+    """Write the header into row 1 if missing. Only probed once per sheet per process.
+
+    Set ASSUME_HEADERS_EXIST=1 to skip the probe entirely (e.g. to keep it off cold starts).
+    """
+    if os.environ.get('ASSUME_HEADERS_EXIST', '') == '1':
+        return
+    # Re-check after a config reload, since the columns may have changed
+    columns = _sheet_columns()
+    header_key = (sheet_id, _CONFIG_CACHE['mtime'])
+    if header_key in _HEADER_WRITTEN:
+        return
+
+    session = _sheets_session(creds)
+    try:
+        response = session.get(f'{SHEETS_API}/{sheet_id}/values/A1', timeout=SHEETS_TIMEOUT)
+        _check_sheets_response(response)
+        rows = response.json().get('values', [])
+        first_cell = rows[0][0] if rows else None
+    except Exception:
+        first_cell = None
+
+    if first_cell != 'Timestamp':
+        # Write header into row 1 (overwrites whatever is there)
+        response = session.put(
+            f'{SHEETS_API}/{sheet_id}/values/A1',
+            params={'valueInputOption': 'USER_ENTERED'},
+            json={'values': [columns.headers]},
+            timeout=SHEETS_TIMEOUT,
+        )
+        _check_sheets_response(response)
+    _HEADER_WRITTEN.add(header_key)
 
 
 def build_header_row(config):
@@ -444,3 +745,16 @@ def build_header_row(config):
     headers.append('AI Additional Context')
 
     return headers
+
+
+@per_config
+def _sheet_columns(config):
+    """Header row and the field ids behind each column, resolved once per config."""
+    ai_field_ids = tuple(f['id'] for f in config.get('ai_inferred_fields', []))
+    return SimpleNamespace(
+        headers=build_header_row(config),
+        metadata_field_ids=tuple((f['id'], f"{f['id']}_other") for f in config.get('metadata_fields', [])),
+        ai_field_ids=ai_field_ids,
+        ai_field_id_set=frozenset(ai_field_ids),
+        category_ids=tuple(c['id'] for c in config.get('categories', [])),
+    )
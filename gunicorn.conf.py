@@ -0,0 +1,24 @@
+"""Gunicorn settings for serving the app outside Vercel.
+
+    gunicorn -c gunicorn.conf.py
+
+Requests spend nearly all their time waiting on Claude, Drive and Sheets, so each
+worker process runs a pool of threads instead of handling one request at a time.
+At most ``workers * threads`` requests are in flight; beyond that they queue.
+
+Each submit also hands one task (the sheet header check) to a per-process pool of
+``IO_POOL_SIZE`` threads (api/index.py) and waits on it. Keep ``threads`` at or below
+``IO_POOL_SIZE``, or submits can wait for a free pool thread.
+"""
+import multiprocessing
+import os
+
+wsgi_app = 'main:app'
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+worker_class = 'gthread'
+workers = multiprocessing.cpu_count() * 2 + 1
+threads = 32
+
+# Claude assessments can take well over gunicorn's 30 s default
+timeout = 120